@@ -1,7 +1,8 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, WebSocket, WebSocketDisconnect
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
 import os
 import logging
 from pathlib import Path
@@ -21,6 +22,8 @@ from tensorflow.keras.callbacks import EarlyStopping
 import ta
 import json
 import asyncio
+import bisect
+import fcntl
 from concurrent.futures import ThreadPoolExecutor
 import warnings
 warnings.filterwarnings('ignore')
@@ -42,11 +45,30 @@ api_router = APIRouter(prefix="/api")
 # Thread pool for ML operations
 executor = ThreadPoolExecutor(max_workers=4)
 
+# Separate pool for the live feed so long training jobs don't stall updates
+live_executor = ThreadPoolExecutor(max_workers=2)
+
 # Define Models
 class StockRequest(BaseModel):
     symbol: str
     period: str = "5y"  # Default to 5 years
     prediction_days: int = 30
+    feature_set: str = "price"  # See FEATURE_SETS
+    request_key: Optional[str] = None  # Requests with the same key share one prediction; unkeyed ones always train
+
+class PredictionJob(BaseModel):
+    id: str
+    symbol: str
+    period: str
+    prediction_days: int
+    feature_set: str = "price"
+    status: str
+    attempts: int = 0
+    result_id: Optional[str] = None
+    error: Optional[str] = None
+    error_status: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
 
 class StockPrediction(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -57,6 +79,7 @@ class StockPrediction(BaseModel):
     prediction_dates: List[str]
     metrics: Dict[str, float]
     indicators: Dict[str, Any]
+    feature_set: str = "price"
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 class StockAnalysis(BaseModel):
@@ -71,6 +94,18 @@ class StockAnalysis(BaseModel):
     rsi: float
     recommendation: str
 
+class AccuracySummary(BaseModel):
+    symbol: str
+    scored: int
+    window: int
+    mae: float
+    rmse: float
+    mape: float
+    direction_accuracy: Optional[float] = None
+    lifetime_mae: float
+    last_realized_date: Optional[str] = None
+    updated_at: datetime
+
 # Stock data processing functions
 def fetch_stock_data(symbol: str, period: str = "5y"):
     """Fetch stock data from Yahoo Finance"""
@@ -110,16 +145,199 @@ def add_technical_indicators(data):
     
     return data
 
-def create_sequences(data, sequence_length=60):
-    """Create sequences for LSTM training"""
-    sequences = []
-    targets = []
-    
-    for i in range(sequence_length, len(data)):
-        sequences.append(data[i-sequence_length:i])
-        targets.append(data[i])
-    
-    return np.array(sequences), np.array(targets)
+# Feature store
+# Per symbol the scaled feature matrix (Close first, then volume and indicators)
+# is kept as raw float32 rows in <SYMBOL>.f32 next to a <SYMBOL>.json header.
+# Only closed bars are written and the file is append-only, so memory maps held
+# by running trainings never change; the latest (possibly still moving) bar is
+# returned in memory. The file is only replaced when history has to change.
+FEATURE_STORE_DIR = Path(os.environ.get('FEATURE_STORE_DIR', ROOT_DIR / 'feature_store'))
+FEATURE_COLUMNS = ['Close', 'Volume', 'MA_10', 'MA_50', 'MA_200', 'RSI', 'MACD',
+                   'MACD_signal', 'MACD_histogram', 'BB_upper', 'BB_middle', 'BB_lower']
+FEATURE_SETS = {
+    'price': ['Close'],
+    'volume': ['Close', 'Volume'],
+    'trend': ['Close', 'MA_10', 'MA_50', 'MA_200'],
+    'momentum': ['Close', 'RSI', 'MACD', 'MACD_signal', 'MACD_histogram'],
+    'volatility': ['Close', 'BB_upper', 'BB_middle', 'BB_lower'],
+    'full': FEATURE_COLUMNS
+}
+INDICATOR_CONTEXT = 400  # bars of history used to extend indicators onto new rows
+RESCALE_TOLERANCE = 0.25  # rebuild once new rows drift this far outside [0, 1]
+# Features in price units; they share Close's scale during training
+PRICE_FEATURES = ['Close', 'MA_10', 'MA_50', 'MA_200', 'BB_upper', 'BB_middle', 'BB_lower']
+
+class FeatureStore:
+    """Memory-mapped, append-only store of scaled feature matrices"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _paths(self, symbol: str):
+        return (self.directory / f"{symbol}.f32", self.directory / f"{symbol}.json",
+                self.directory / f"{symbol}.lock")
+
+    def _open(self, symbol: str, meta: dict):
+        matrix_path, _, _ = self._paths(symbol)
+        if meta['rows'] == 0:
+            return np.empty((0, len(meta['columns'])), dtype=np.float32)
+        return np.memmap(matrix_path, dtype=np.float32, mode='r',
+                         shape=(meta['rows'], len(meta['columns'])))
+
+    def _read_meta(self, symbol: str):
+        _, meta_path, _ = self._paths(symbol)
+        if not meta_path.exists():
+            return None
+        with open(meta_path) as f:
+            return json.load(f)
+
+    def _write_meta(self, symbol: str, meta: dict):
+        _, meta_path, _ = self._paths(symbol)
+        tmp_path = meta_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    @staticmethod
+    def compute_features(bars):
+        """Unscaled FEATURE_COLUMNS for bars with Close and Volume"""
+        return add_technical_indicators(bars[['Close', 'Volume']].copy())[FEATURE_COLUMNS].values
+
+    @staticmethod
+    def _scale(features, meta: dict):
+        data_min = np.array(meta['data_min'])
+        data_range = np.array(meta['data_max']) - data_min
+        data_range[~(data_range > 0)] = 1
+        return (features - data_min) / data_range
+
+    @staticmethod
+    def unscale_columns(values, meta: dict, selector):
+        """Map scaled rows restricted to `selector` back to original units"""
+        data_min = np.array(meta['data_min'])
+        data_range = np.array(meta['data_max']) - data_min
+        data_range[~(data_range > 0)] = 1
+        return np.asarray(values, dtype=np.float64) * data_range[selector] + data_min[selector]
+
+    @staticmethod
+    def unscale(values, meta: dict, column: str):
+        """Map scaled values of one column back to its original units"""
+        index = meta['columns'].index(column)
+        data_range = meta['data_max'][index] - meta['data_min'][index]
+        return np.asarray(values, dtype=np.float64) * (data_range if data_range > 0 else 1) + meta['data_min'][index]
+
+    @staticmethod
+    def _first_valid(scaled):
+        valid = ~np.isnan(scaled)
+        return [int(np.argmax(valid[:, i])) if valid[:, i].any() else None for i in range(scaled.shape[1])]
+
+    def _build(self, symbol: str, data):
+        features = self.compute_features(data)
+        scaler = MinMaxScaler(feature_range=(0, 1))
+        scaled = scaler.fit_transform(features).astype(np.float32)
+        closed = scaled[:-1]
+        meta = {
+            'columns': FEATURE_COLUMNS,
+            'rows': len(closed),
+            'dates': data.index[:-1].strftime('%Y-%m-%d').tolist(),
+            'data_min': [float(v) for v in scaler.data_min_],
+            'data_max': [float(v) for v in scaler.data_max_],
+            'first_valid': self._first_valid(closed)
+        }
+        # Write a new file and swap it in so open memory maps keep the old one
+        matrix_path, _, _ = self._paths(symbol)
+        tmp_path = matrix_path.with_suffix('.f32.tmp')
+        closed.tofile(tmp_path)
+        os.replace(tmp_path, matrix_path)
+        self._write_meta(symbol, meta)
+        return meta, scaled[-1]
+
+    def _append(self, symbol: str, meta: dict, data):
+        """Extend the stored matrix with bars from `data`; None means rebuild instead"""
+        dates = data.index.strftime('%Y-%m-%d').tolist()
+        stored_dates = meta['dates']
+        if meta['columns'] != FEATURE_COLUMNS or not stored_dates:
+            return None
+        if dates[0] < stored_dates[0] or stored_dates[-1] not in dates[:-1]:
+            return None
+        
+        position = dates.index(stored_dates[-1])
+        rows = meta['rows']
+        matrix = self._open(symbol, meta)
+        
+        # Yahoo back-adjusts history after splits and dividends
+        stored_close = float(self.unscale(matrix[rows - 1, 0], meta, 'Close'))
+        fetched_close = float(data['Close'].iloc[position])
+        if abs(stored_close - fetched_close) > 1e-4 * abs(fetched_close):
+            return None
+        
+        context_start = max(0, rows - INDICATOR_CONTEXT)
+        new_bars = data.iloc[position + 1:]
+        bars = pd.DataFrame({
+            'Close': np.concatenate([self.unscale(matrix[context_start:, 0], meta, 'Close'),
+                                     new_bars['Close'].values]),
+            'Volume': np.concatenate([self.unscale(matrix[context_start:, 1], meta, 'Volume'),
+                                      new_bars['Volume'].values])
+        })
+        features = self.compute_features(bars)[-len(new_bars):]
+        # Columns that had no valid values when scaled need fresh scaling parameters
+        for i, first_valid in enumerate(meta['first_valid']):
+            if first_valid is None and not np.isnan(features[:, i]).all():
+                return None
+        scaled = self._scale(features, meta).astype(np.float32)
+        if np.nanmin(scaled) < -RESCALE_TOLERANCE or np.nanmax(scaled) > 1 + RESCALE_TOLERANCE:
+            return None
+        
+        # Newly closed bars are appended; the last bar stays out of the file
+        closed = scaled[:-1]
+        if len(closed):
+            matrix_path, _, _ = self._paths(symbol)
+            with open(matrix_path, 'ab') as f:
+                f.write(closed.tobytes())
+            meta['rows'] = rows + len(closed)
+            meta['dates'] = stored_dates + dates[position + 1:-1]
+            new_first_valid = self._first_valid(closed)
+            meta['first_valid'] = [
+                stored if stored is not None else (None if new is None else rows + new)
+                for stored, new in zip(meta['first_valid'], new_first_valid)
+            ]
+            self._write_meta(symbol, meta)
+        return meta, scaled[-1]
+
+    def sync(self, symbol: str, data):
+        """Bring the store up to date with `data`.
+
+        Returns (matrix, latest, meta): a read-only memory map of the closed bars
+        and the scaled row for the last bar in `data`, which is never written.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _, _, lock_path = self._paths(symbol)
+        with open(lock_path, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                meta = self._read_meta(symbol)
+                synced = self._append(symbol, meta, data) if meta is not None else None
+                if synced is None:
+                    synced = self._build(symbol, data)
+                meta, latest = synced
+                return self._open(symbol, meta), latest, meta
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def column_selector(meta: dict, columns: List[str]):
+        """Index for the given columns; a slice (no copy) when they are contiguous"""
+        indices = [meta['columns'].index(column) for column in columns]
+        if indices == list(range(indices[0], indices[0] + len(indices))):
+            return slice(indices[0], indices[0] + len(indices))
+        return indices
+
+feature_store = FeatureStore(FEATURE_STORE_DIR)
+
+def create_windows(features, sequence_length=60):
+    """Create LSTM training windows as strided views over the feature matrix"""
+    windows = np.lib.stride_tricks.sliding_window_view(features, sequence_length, axis=0)
+    # (samples, features, time) -> (samples, time, features); the target is the next Close
+    return windows[:-1].transpose(0, 2, 1), features[sequence_length:, 0]
 
 def build_lstm_model(input_shape):
     """Build LSTM model for stock prediction"""
@@ -137,25 +355,43 @@ def build_lstm_model(input_shape):
     model.compile(optimizer='adam', loss='mean_squared_error')
     return model
 
-def train_and_predict(symbol: str, period: str = "5y", prediction_days: int = 30):
+def train_and_predict(symbol: str, period: str = "5y", prediction_days: int = 30, feature_set: str = "price"):
     """Train LSTM model and make predictions"""
     try:
         # Fetch data
         data, info = fetch_stock_data(symbol, period)
         
-        # Add technical indicators
-        data = add_technical_indicators(data)
+        # Scaled features (price plus indicators) from the feature store
+        matrix, latest_row, meta = feature_store.sync(symbol, data)
+        columns = FEATURE_SETS[feature_set]
+        selector = FeatureStore.column_selector(meta, columns)
+        sequence_length = 60
+        first_valid = [meta['first_valid'][meta['columns'].index(column)] for column in columns]
+        period_start = bisect.bisect_left(meta['dates'], data.index[0].strftime('%Y-%m-%d'))
+        if None in first_valid or meta['rows'] - max(period_start, *first_valid) <= 2 * sequence_length:
+            raise HTTPException(status_code=400, detail=f"Not enough history in {period} for the {feature_set} feature set")
         
-        # Prepare data for LSTM
-        price_data = data['Close'].values.reshape(-1, 1)
+        # Re-fit every column's scale on the requested period, like a fresh MinMaxScaler
+        # would, so results don't depend on when this host's store was built.
+        # Price-unit columns share one scale to keep Close comparable to its MAs and bands.
+        raw_data = FeatureStore.unscale_columns(matrix[max(period_start, *first_valid):, selector], meta, selector)
+        raw_latest = FeatureStore.unscale_columns(latest_row[selector], meta, selector).reshape(1, -1)
+        raw_all = np.vstack([raw_data, raw_latest])
+        col_min = np.nanmin(raw_all, axis=0)
+        col_max = np.nanmax(raw_all, axis=0)
+        price_columns = [i for i, column in enumerate(columns) if column in PRICE_FEATURES]
+        col_min[price_columns] = col_min[price_columns].min()
+        col_max[price_columns] = col_max[price_columns].max()
+        col_range = col_max - col_min
+        col_range[~(col_range > 0)] = 1
+        scaled_data = ((raw_data - col_min) / col_range).astype(np.float32)
+        latest_step = ((raw_latest - col_min) / col_range).astype(np.float32)
         
-        # Scale the data
-        scaler = MinMaxScaler(feature_range=(0, 1))
-        scaled_data = scaler.fit_transform(price_data)
+        def to_price(values):
+            return np.asarray(values, dtype=np.float64) * col_range[0] + col_min[0]
         
         # Create sequences
-        sequence_length = 60
-        X, y = create_sequences(scaled_data, sequence_length)
+        X, y = create_windows(scaled_data, sequence_length)
         
         # Split data
         split_ratio = 0.8
@@ -164,7 +400,7 @@ def train_and_predict(symbol: str, period: str = "5y", prediction_days: int = 30
         y_train, y_test = y[:split_index], y[split_index:]
         
         # Build and train model
-        model = build_lstm_model((X_train.shape[1], 1))
+        model = build_lstm_model((X_train.shape[1], X_train.shape[2]))
         
         early_stopping = EarlyStopping(monitor='loss', patience=10, restore_best_weights=True)
         model.fit(X_train, y_train, epochs=50, batch_size=32, 
@@ -172,25 +408,36 @@ def train_and_predict(symbol: str, period: str = "5y", prediction_days: int = 30
         
         # Make predictions on test set
         test_predictions = model.predict(X_test)
-        test_predictions = scaler.inverse_transform(test_predictions)
-        actual_test_prices = scaler.inverse_transform(y_test.reshape(-1, 1))
+        test_predictions = to_price(test_predictions)
+        actual_test_prices = to_price(y_test.reshape(-1, 1))
         
         # Calculate metrics
         mse = mean_squared_error(actual_test_prices, test_predictions)
         mae = mean_absolute_error(actual_test_prices, test_predictions)
         rmse = np.sqrt(mse)
         
-        # Make future predictions
-        last_sequence = scaled_data[-sequence_length:]
+        # Make future predictions; indicators are recomputed along the predicted Close path
+        last_sequence = np.vstack([scaled_data[-(sequence_length - 1):], latest_step])
+        n_features = last_sequence.shape[1]
+        column_indices = [FEATURE_COLUMNS.index(column) for column in columns]
+        history = data[['Close', 'Volume']].tail(INDICATOR_CONTEXT).reset_index(drop=True)
         future_predictions = []
         
         for _ in range(prediction_days):
-            prediction = model.predict(last_sequence.reshape(1, sequence_length, 1), verbose=0)
+            prediction = model.predict(last_sequence.reshape(1, sequence_length, n_features), verbose=0)
             future_predictions.append(prediction[0, 0])
-            last_sequence = np.append(last_sequence[1:], prediction[0, 0])
+            if n_features > 1:
+                # Volume has no forecast, so the last bar's volume is carried forward
+                next_bar = {'Close': float(to_price(prediction[0, 0])), 'Volume': history['Volume'].iloc[-1]}
+                history = pd.concat([history, pd.DataFrame([next_bar])], ignore_index=True)
+                features = FeatureStore.compute_features(history)[-1, column_indices]
+                next_step = (features - col_min) / col_range
+            else:
+                next_step = prediction[0]
+            last_sequence = np.vstack([last_sequence[1:], next_step])
         
         # Inverse transform future predictions
-        future_predictions = scaler.inverse_transform(np.array(future_predictions).reshape(-1, 1))
+        future_predictions = to_price(future_predictions)
         future_predictions = future_predictions.flatten().tolist()
         
         # Get recent actual prices for comparison
@@ -207,15 +454,17 @@ def train_and_predict(symbol: str, period: str = "5y", prediction_days: int = 30
                 future_date += timedelta(days=1)
             future_dates.append(future_date.strftime('%Y-%m-%d'))
         
-        # Get current indicators
+        # Get current indicators from the latest bar
+        latest = {column: float(FeatureStore.unscale(latest_row[i], meta, column))
+                  for i, column in enumerate(meta['columns'])}
         current_indicators = {
-            'ma_10': float(data['MA_10'].iloc[-1]) if not pd.isna(data['MA_10'].iloc[-1]) else 0,
-            'ma_50': float(data['MA_50'].iloc[-1]) if not pd.isna(data['MA_50'].iloc[-1]) else 0,
-            'ma_200': float(data['MA_200'].iloc[-1]) if not pd.isna(data['MA_200'].iloc[-1]) else 0,
-            'rsi': float(data['RSI'].iloc[-1]) if not pd.isna(data['RSI'].iloc[-1]) else 50,
-            'macd': float(data['MACD'].iloc[-1]) if not pd.isna(data['MACD'].iloc[-1]) else 0,
-            'bb_upper': float(data['BB_upper'].iloc[-1]) if not pd.isna(data['BB_upper'].iloc[-1]) else 0,
-            'bb_lower': float(data['BB_lower'].iloc[-1]) if not pd.isna(data['BB_lower'].iloc[-1]) else 0,
+            'ma_10': latest['MA_10'] if not pd.isna(latest['MA_10']) else 0,
+            'ma_50': latest['MA_50'] if not pd.isna(latest['MA_50']) else 0,
+            'ma_200': latest['MA_200'] if not pd.isna(latest['MA_200']) else 0,
+            'rsi': latest['RSI'] if not pd.isna(latest['RSI']) else 50,
+            'macd': latest['MACD'] if not pd.isna(latest['MACD']) else 0,
+            'bb_upper': latest['BB_upper'] if not pd.isna(latest['BB_upper']) else 0,
+            'bb_lower': latest['BB_lower'] if not pd.isna(latest['BB_lower']) else 0,
             'volume': int(data['Volume'].iloc[-1]),
             'current_price': float(data['Close'].iloc[-1])
         }
@@ -233,6 +482,7 @@ def train_and_predict(symbol: str, period: str = "5y", prediction_days: int = 30
                 'accuracy': float(max(0, 100 - (mae / np.mean(actual_test_prices) * 100)))
             },
             'indicators': current_indicators,
+            'feature_set': feature_set,
             'info': {
                 'market_cap': info.get('marketCap'),
                 'pe_ratio': info.get('trailingPE'),
@@ -240,6 +490,8 @@ def train_and_predict(symbol: str, period: str = "5y", prediction_days: int = 30
             }
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in prediction: {str(e)}")
 
@@ -247,54 +499,561 @@ def get_stock_analysis(symbol: str):
     """Get current stock analysis"""
     try:
         data, info = fetch_stock_data(symbol, "1y")
-        data = add_technical_indicators(data)
-        
-        current_price = float(data['Close'].iloc[-1])
-        prev_price = float(data['Close'].iloc[-2])
-        change = current_price - prev_price
-        change_percent = (change / prev_price) * 100
+        return analyze_price_data(symbol, data, info)
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error in analysis: {str(e)}")
+
+def analyze_price_data(symbol: str, data, info):
+    """Build a StockAnalysis from already fetched price bars"""
+    data = add_technical_indicators(data)
+    
+    current_price = float(data['Close'].iloc[-1])
+    prev_price = float(data['Close'].iloc[-2])
+    change = current_price - prev_price
+    change_percent = (change / prev_price) * 100
+    
+    # Generate recommendation based on indicators
+    rsi = float(data['RSI'].iloc[-1]) if not pd.isna(data['RSI'].iloc[-1]) else 50
+    ma_10 = float(data['MA_10'].iloc[-1]) if not pd.isna(data['MA_10'].iloc[-1]) else current_price
+    ma_50 = float(data['MA_50'].iloc[-1]) if not pd.isna(data['MA_50'].iloc[-1]) else current_price
+    
+    if rsi < 30 and current_price > ma_10 > ma_50:
+        recommendation = "BUY"
+    elif rsi > 70 and current_price < ma_10 < ma_50:
+        recommendation = "SELL"
+    else:
+        recommendation = "HOLD"
+    
+    return StockAnalysis(
+        symbol=symbol,
+        current_price=current_price,
+        change=change,
+        change_percent=change_percent,
+        volume=int(data['Volume'].iloc[-1]),
+        market_cap=info.get('marketCap'),
+        pe_ratio=info.get('trailingPE'),
+        moving_averages={
+            'ma_10': ma_10,
+            'ma_50': ma_50,
+            'ma_200': float(data['MA_200'].iloc[-1]) if not pd.isna(data['MA_200'].iloc[-1]) else current_price
+        },
+        rsi=rsi,
+        recommendation=recommendation
+    )
+
+# Live watchlist feed
+LIVE_HISTORY_ROWS = 260  # enough bars for the 200-day moving average
+LIVE_MAX_SYMBOLS = int(os.environ.get('LIVE_MAX_SYMBOLS', '50'))  # per connection
+
+class PriceSource:
+    """Where the live feed gets its bars from"""
+    poll_interval: float = 60.0
+    scores_accuracy: bool = True  # whether its bars may score stored predictions
+
+    def load(self, symbol: str):
+        """Return (history, info) to seed a symbol's feed"""
+        raise NotImplementedError
+
+    def poll(self, symbol: str, since):
+        """Return bars from `since` on, including a revised `since` bar (may be empty)"""
+        raise NotImplementedError
+
+class YahooPriceSource(PriceSource):
+    """Poll Yahoo Finance for new daily bars"""
+
+    def __init__(self, poll_interval: float = 60.0):
+        self.poll_interval = poll_interval
+
+    def load(self, symbol: str):
+        return fetch_stock_data(symbol, "1y")
+
+    def poll(self, symbol: str, since):
+        data = yf.Ticker(symbol).history(period="5d")
+        return data[data.index >= since]
+
+class ReplayPriceSource(PriceSource):
+    """Replay recorded bars from `<directory>/<SYMBOL>.csv`, one bar per poll"""
+    scores_accuracy = False  # recorded bars must not touch real accuracy stats
+
+    def __init__(self, directory: str, poll_interval: float = 1.0, warmup: int = LIVE_HISTORY_ROWS):
+        self.directory = Path(directory)
+        self.poll_interval = poll_interval
+        self.warmup = warmup
+        self._bars = {}
+        self._cursor = {}
+
+    def load(self, symbol: str):
+        path = self.directory / f"{symbol}.csv"
+        if not path.exists():
+            raise ValueError(f"No recorded bars for symbol {symbol}")
+        bars = pd.read_csv(path, index_col=0, parse_dates=True)
+        self._bars[symbol] = bars
+        self._cursor[symbol] = min(self.warmup, len(bars))
+        return bars.iloc[:self._cursor[symbol]], {}
+
+    def poll(self, symbol: str, since):
+        bars = self._bars[symbol]
+        cursor = self._cursor[symbol]
+        if cursor >= len(bars):
+            return bars.iloc[0:0]
+        self._cursor[symbol] = cursor + 1
+        return bars.iloc[cursor:cursor + 1]
+
+def create_price_source():
+    """Pick the live price source from LIVE_PRICE_SOURCE ("yahoo" or "replay:<dir>")"""
+    spec = os.environ.get('LIVE_PRICE_SOURCE', 'yahoo')
+    interval = os.environ.get('LIVE_POLL_SECONDS')
+    if spec.startswith('replay:'):
+        return ReplayPriceSource(spec[len('replay:'):], poll_interval=float(interval or 1))
+    return YahooPriceSource(poll_interval=float(interval or 60))
+
+class LiveClient:
+    """Outgoing messages for one WebSocket, keeping only the newest per key"""
+
+    def __init__(self):
+        self.pending: Dict[str, str] = {}
+        self.ready = asyncio.Event()
+
+    def offer(self, key: str, message: str):
+        # A slow client skips superseded updates for a symbol but never loses a symbol
+        self.pending[key] = message
+        self.ready.set()
+
+    async def next(self):
+        while not self.pending:
+            self.ready.clear()
+            await self.ready.wait()
+        key = next(iter(self.pending))
+        return self.pending.pop(key)
+
+class LiveFeedHub:
+    """Runs one analysis loop per symbol and fans each result out to all subscribers"""
+
+    def __init__(self, source: PriceSource):
+        self.source = source
+        self.subscribers: Dict[str, set] = {}
+        self.feeds: Dict[str, asyncio.Task] = {}
+        self.latest: Dict[str, str] = {}
+
+    def subscribe(self, symbol: str, client: LiveClient):
+        self.subscribers.setdefault(symbol, set()).add(client)
+        if symbol in self.latest:
+            client.offer(symbol, self.latest[symbol])
+        if symbol not in self.feeds:
+            self.feeds[symbol] = asyncio.create_task(self._run_feed(symbol))
+
+    def unsubscribe(self, symbol: str, client: LiveClient):
+        clients = self.subscribers.get(symbol)
+        if clients is None:
+            return
+        clients.discard(client)
+        if not clients:
+            self._stop_feed(symbol)
+
+    def _stop_feed(self, symbol: str):
+        self.subscribers.pop(symbol, None)
+        self.latest.pop(symbol, None)
+        task = self.feeds.pop(symbol, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    def _broadcast(self, symbol: str, message: str):
+        for client in self.subscribers.get(symbol, ()):
+            client.offer(symbol, message)
+
+    async def _run_feed(self, symbol: str):
+        loop = asyncio.get_event_loop()
+        try:
+            data, info = await loop.run_in_executor(live_executor, self.source.load, symbol)
+            data = data[['Open', 'High', 'Low', 'Close', 'Volume']].tail(LIVE_HISTORY_ROWS)
+            while True:
+                analysis = await loop.run_in_executor(live_executor, analyze_price_data, symbol, data.copy(), info)
+                message = json.dumps({"type": "analysis", "data": analysis.dict()})
+                self.latest[symbol] = message
+                self._broadcast(symbol, message)
+                if self.source.scores_accuracy:
+                    await self._score_accuracy(symbol, data)
+                
+                # Wait for a new bar or a revision of the bar still in progress
+                updated = data
+                while updated.equals(data):
+                    await asyncio.sleep(self.source.poll_interval)
+                    new_bars = await loop.run_in_executor(live_executor, self.source.poll, symbol, data.index[-1])
+                    updated = pd.concat([data, new_bars[['Open', 'High', 'Low', 'Close', 'Volume']]])
+                    updated = updated[~updated.index.duplicated(keep='last')].tail(LIVE_HISTORY_ROWS)
+                data = updated
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Live feed for {symbol} stopped: {e}")
+            detail = getattr(e, 'detail', str(e))
+            self._broadcast(symbol, json.dumps({"type": "error", "symbol": symbol, "detail": detail}))
+            self._stop_feed(symbol)
+
+    @staticmethod
+    async def _score_accuracy(symbol: str, data):
+        try:
+            await accuracy_tracker.score_bars(symbol, data)
+        except Exception as e:
+            logger.warning(f"Accuracy scoring for {symbol} failed: {e}")
+
+    async def shutdown(self):
+        for task in self.feeds.values():
+            task.cancel()
+        self.feeds.clear()
+
+live_hub = LiveFeedHub(create_price_source())
+
+# Prediction job queue (PREDICTION_MODE=queue)
+# /api/predict enqueues into db.prediction_jobs and separate worker processes
+# (see worker.py) claim jobs with a lease, train, and write the result back.
+PREDICTION_MODE = os.environ.get('PREDICTION_MODE', 'local')
+JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', '120'))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '3'))
+JOB_WAIT_SECONDS = int(os.environ.get('JOB_WAIT_SECONDS', '600'))
+JOB_POLL_SECONDS = 1.0
+
+def prediction_request_key(request: StockRequest):
+    """Job id for a request; only caller-supplied keys de-duplicate, as in local mode"""
+    if request.request_key:
+        return request.request_key
+    return f"job-{uuid.uuid4()}"
+
+async def ensure_job_indexes():
+    """Create the indexes the job queue relies on"""
+    await db.prediction_jobs.create_index([("status", 1), ("created_at", 1)])
+    await db.predictions.create_index(
+        "request_key", unique=True,
+        partialFilterExpression={"request_key": {"$exists": True}}
+    )
+
+async def enqueue_prediction_job(request: StockRequest):
+    """Insert a queued job for the request unless one with the same key exists"""
+    key = prediction_request_key(request)
+    now = datetime.utcnow()
+    await db.prediction_jobs.update_one(
+        {"_id": key},
+        {"$setOnInsert": {
+            "symbol": request.symbol.upper(),
+            "period": request.period,
+            "prediction_days": request.prediction_days,
+            "feature_set": request.feature_set,
+            "status": "queued",
+            "attempts": 0,
+            "lease_owner": None,
+            "lease_expires": None,
+            "result_id": None,
+            "error": None,
+            "error_status": None,
+            "created_at": now,
+            "updated_at": now
+        }},
+        upsert=True
+    )
+    # Asking again for a request that failed gives it a fresh set of attempts
+    await db.prediction_jobs.update_one(
+        {"_id": key, "status": "failed"},
+        {"$set": {"status": "queued", "attempts": 0, "error": None, "error_status": None, "updated_at": now}}
+    )
+    return key
+
+async def claim_prediction_job(worker_id: str):
+    """Atomically lease the oldest runnable job, including ones whose worker died"""
+    now = datetime.utcnow()
+    return await db.prediction_jobs.find_one_and_update(
+        {
+            "attempts": {"$lt": JOB_MAX_ATTEMPTS},
+            "$or": [
+                {"status": "queued"},
+                {"status": "running", "lease_expires": {"$lt": now}}
+            ]
+        },
+        {
+            "$set": {
+                "status": "running",
+                "lease_owner": worker_id,
+                "lease_expires": now + timedelta(seconds=JOB_LEASE_SECONDS),
+                "updated_at": now
+            },
+            "$inc": {"attempts": 1}
+        },
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+async def renew_job_lease(job_id: str, worker_id: str):
+    """Extend a lease; returns False if another worker has taken the job over"""
+    now = datetime.utcnow()
+    result = await db.prediction_jobs.update_one(
+        {"_id": job_id, "status": "running", "lease_owner": worker_id},
+        {"$set": {"lease_expires": now + timedelta(seconds=JOB_LEASE_SECONDS), "updated_at": now}}
+    )
+    return result.matched_count == 1
+
+async def store_prediction(result: dict, request_key: Optional[str] = None):
+    """Save a prediction; with a request key the first one stored wins"""
+    prediction = StockPrediction(**result)
+    document = prediction.dict()
+    if request_key is None:
+        await db.predictions.insert_one(document)
+        await accuracy_tracker.track_or_defer(document)
+        return prediction
+    
+    document["request_key"] = request_key
+    stored = await db.predictions.update_one(
+        {"request_key": request_key},
+        {"$setOnInsert": document},
+        upsert=True
+    )
+    if stored.upserted_id is not None:
+        await accuracy_tracker.track_or_defer(document)
+    return StockPrediction(**await db.predictions.find_one({"request_key": request_key}))
+
+async def complete_prediction_job(job_id: str, result: dict):
+    """Store the prediction once per request key and mark the job done"""
+    stored = await store_prediction(result, job_id)
+    await db.prediction_jobs.update_one(
+        {"_id": job_id, "status": {"$ne": "done"}},
+        {"$set": {"status": "done", "result_id": stored.id, "error": None,
+                  "lease_owner": None, "updated_at": datetime.utcnow()}}
+    )
+
+async def fail_prediction_job(job_id: str, worker_id: str, error: str, retry: bool, status_code: int = 500):
+    """Record a failure; retryable failures go back to the queue while attempts remain"""
+    job = await db.prediction_jobs.find_one({"_id": job_id}, {"attempts": 1})
+    status = "queued" if retry and job and job["attempts"] < JOB_MAX_ATTEMPTS else "failed"
+    await db.prediction_jobs.update_one(
+        {"_id": job_id, "status": "running", "lease_owner": worker_id},
+        {"$set": {"status": status, "error": error, "error_status": status_code, "lease_owner": None,
+                  "lease_expires": None, "updated_at": datetime.utcnow()}}
+    )
+
+async def expire_abandoned_jobs():
+    """Fail jobs whose workers died on every allowed attempt"""
+    now = datetime.utcnow()
+    await db.prediction_jobs.update_many(
+        {"status": "running", "lease_expires": {"$lt": now}, "attempts": {"$gte": JOB_MAX_ATTEMPTS}},
+        {"$set": {"status": "failed", "error": "Worker lease expired too many times",
+                  "lease_owner": None, "updated_at": now}}
+    )
+
+def job_from_document(document: dict):
+    return PredictionJob(id=document["_id"], **{k: v for k, v in document.items() if k != "_id"})
+
+async def wait_for_prediction_job(job_id: str):
+    """Poll the job until a worker finishes it and return the stored prediction"""
+    deadline = asyncio.get_event_loop().time() + JOB_WAIT_SECONDS
+    while True:
+        job = await db.prediction_jobs.find_one({"_id": job_id})
+        if job["status"] == "done":
+            prediction = await db.predictions.find_one({"id": job["result_id"]})
+            return StockPrediction(**prediction)
+        if job["status"] == "failed":
+            # Same status local mode would have returned, e.g. 400 for an unknown symbol
+            raise HTTPException(status_code=job.get('error_status') or 500, detail=job['error'])
+        if asyncio.get_event_loop().time() >= deadline:
+            raise HTTPException(status_code=504, detail=f"Prediction job {job_id} is still {job['status']}")
+        await asyncio.sleep(JOB_POLL_SECONDS)
+
+# Realized accuracy tracking
+# Each stored prediction is expanded into one pending row per target date in
+# db.prediction_targets. When bars arrive only the rows whose dates have just
+# been realized are scored, and per-symbol aggregates in db.accuracy_stats are
+# updated in place so the summary endpoint never touches db.predictions.
+ACCURACY_WINDOW = int(os.environ.get('ACCURACY_WINDOW', '100'))
+ACCURACY_SWEEP_SECONDS = int(os.environ.get('ACCURACY_SWEEP_SECONDS', '3600'))
+ACCURACY_APPLIED_IDS = 1000  # recently applied target ids kept to make scoring retry-safe
+
+def history_period_since(date_str: str):
+    """Smallest Yahoo period that reaches back to the given date"""
+    days = (datetime.utcnow() - datetime.strptime(date_str, '%Y-%m-%d')).days
+    for period, span in (("1mo", 25), ("6mo", 170), ("1y", 360)):
+        if days <= span:
+            return period
+    return "5y"
+
+def summarize_accuracy(stats: dict):
+    """Turn an accuracy_stats document into an AccuracySummary"""
+    recent = stats.get('recent', [])
+    window = len(recent)
+    directional = [entry['direction_hit'] for entry in recent if entry.get('direction_hit') is not None]
+    return AccuracySummary(
+        symbol=stats['_id'],
+        scored=stats['scored'],
+        window=window,
+        mae=float(np.mean([entry['abs_error'] for entry in recent])) if window else 0,
+        rmse=float(np.sqrt(np.mean([entry['sq_error'] for entry in recent]))) if window else 0,
+        mape=float(np.mean([entry['abs_pct_error'] for entry in recent])) if window else 0,
+        direction_accuracy=float(np.mean(directional) * 100) if directional else None,
+        lifetime_mae=stats['sum_abs_error'] / stats['scored'] if stats['scored'] else 0,
+        last_realized_date=stats.get('last_realized_date'),
+        updated_at=stats['updated_at']
+    )
+
+class AccuracyTracker:
+    """Scores stored predictions incrementally as their target dates are realized"""
+
+    async def ensure_indexes(self):
+        await db.predictions.create_index("id")
+        await db.predictions.create_index("tracked")
+        await db.prediction_targets.create_index([("symbol", 1), ("scored", 1), ("target_date", 1)])
+        await db.prediction_targets.create_index([("scored", 1), ("target_date", 1)])
+
+    async def track_prediction(self, prediction: dict):
+        """Register one pending target per forecast date of a stored prediction"""
+        base_price = prediction.get('indicators', {}).get('current_price')
+        operations = []
+        for horizon, (target_date, predicted) in enumerate(
+                zip(prediction['prediction_dates'], prediction['predictions']), start=1):
+            target_id = f"{prediction['id']}:{target_date}"
+            operations.append(UpdateOne(
+                {"_id": target_id},
+                {"$setOnInsert": {
+                    "prediction_id": prediction['id'],
+                    "symbol": prediction['symbol'],
+                    "target_date": target_date,
+                    "horizon": horizon,
+                    "predicted": float(predicted),
+                    "base_price": base_price,
+                    "scored": False
+                }},
+                upsert=True
+            ))
+        if operations:
+            await db.prediction_targets.bulk_write(operations, ordered=False)
+        # Flag only once the targets exist so a crash in between leaves it for backfill
+        await db.predictions.update_one({"id": prediction['id']}, {"$set": {"tracked": True}})
+
+    async def track_or_defer(self, prediction: dict):
+        """Track a just-stored prediction; on failure the next sweep's backfill retries it"""
+        try:
+            await self.track_prediction(prediction)
+        except Exception as e:
+            logger.warning(f"Could not track prediction {prediction['id']}, deferring to backfill: {e}")
+
+    async def backfill(self):
+        """Register predictions that are not tracked yet (older ones or failed tracking)"""
+        async for prediction in db.predictions.find({"tracked": {"$ne": True}}):
+            await self.track_prediction(prediction)
+
+    async def score_bars(self, symbol: str, bars):
+        """Score pending targets realized by the given closed daily bars"""
+        today = datetime.utcnow().strftime('%Y-%m-%d')
+        dates = bars.index.strftime('%Y-%m-%d').tolist()
+        closes = bars['Close'].tolist()
+        # Today's bar is still moving; only score closed sessions
+        while dates and dates[-1] >= today:
+            dates.pop()
+            closes.pop()
+        if not dates:
+            return 0
         
-        # Generate recommendation based on indicators
-        rsi = float(data['RSI'].iloc[-1]) if not pd.isna(data['RSI'].iloc[-1]) else 50
-        ma_10 = float(data['MA_10'].iloc[-1]) if not pd.isna(data['MA_10'].iloc[-1]) else current_price
-        ma_50 = float(data['MA_50'].iloc[-1]) if not pd.isna(data['MA_50'].iloc[-1]) else current_price
+        pending = await db.prediction_targets.find({
+            "symbol": symbol,
+            "scored": False,
+            "target_date": {"$gte": dates[0], "$lte": dates[-1]}
+        }).sort("target_date", 1).to_list(None)
         
-        if rsi < 30 and current_price > ma_10 > ma_50:
-            recommendation = "BUY"
-        elif rsi > 70 and current_price < ma_10 < ma_50:
-            recommendation = "SELL"
-        else:
-            recommendation = "HOLD"
+        scored = 0
+        for target in pending:
+            # Targets that fall on market holidays are realized by the next session
+            position = bisect.bisect_left(dates, target['target_date'])
+            if await self._score_target(target, dates[position], float(closes[position])):
+                scored += 1
+        return scored
+
+    async def _score_target(self, target: dict, realized_date: str, actual: float):
+        error = target['predicted'] - actual
+        base_price = target.get('base_price')
+        direction_hit = None
+        if base_price:
+            direction_hit = int(np.sign(target['predicted'] - base_price) == np.sign(actual - base_price))
         
-        return StockAnalysis(
-            symbol=symbol,
-            current_price=current_price,
-            change=change,
-            change_percent=change_percent,
-            volume=int(data['Volume'].iloc[-1]),
-            market_cap=info.get('marketCap'),
-            pe_ratio=info.get('trailingPE'),
-            moving_averages={
-                'ma_10': ma_10,
-                'ma_50': ma_50,
-                'ma_200': float(data['MA_200'].iloc[-1]) if not pd.isna(data['MA_200'].iloc[-1]) else current_price
-            },
-            rsi=rsi,
-            recommendation=recommendation
+        entry = {
+            "date": realized_date,
+            "horizon": target['horizon'],
+            "abs_error": abs(error),
+            "sq_error": error ** 2,
+            "abs_pct_error": abs(error) / actual * 100 if actual else 0,
+            "direction_hit": direction_hit
+        }
+        # Aggregates first, guarded by the target id, then the target: a crash in
+        # between leaves the target pending and the retry skips the applied stats
+        await db.accuracy_stats.update_one(
+            {"_id": target['symbol']},
+            {"$setOnInsert": {"scored": 0, "sum_abs_error": 0.0, "sum_sq_error": 0.0,
+                              "recent": [], "applied": [], "updated_at": datetime.utcnow()}},
+            upsert=True
         )
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error in analysis: {str(e)}")
+        applied = await db.accuracy_stats.update_one(
+            {"_id": target['symbol'], "applied": {"$ne": target["_id"]}},
+            {
+                "$inc": {"scored": 1, "sum_abs_error": entry['abs_error'], "sum_sq_error": entry['sq_error']},
+                "$push": {
+                    "recent": {"$each": [entry], "$slice": -ACCURACY_WINDOW},
+                    "applied": {"$each": [target["_id"]], "$slice": -ACCURACY_APPLIED_IDS}
+                },
+                "$max": {"last_realized_date": realized_date},
+                "$set": {"updated_at": datetime.utcnow()}
+            }
+        )
+        await db.prediction_targets.update_one(
+            {"_id": target["_id"], "scored": False},
+            {"$set": {"scored": True, "actual": actual, "error": error, "realized_date": realized_date}}
+        )
+        return applied.modified_count == 1  # False if already applied elsewhere
+
+    async def sweep(self):
+        """Fetch bars for symbols with due targets that no live feed has scored"""
+        await self.backfill()
+        today = datetime.utcnow().strftime('%Y-%m-%d')
+        loop = asyncio.get_event_loop()
+        symbols = await db.prediction_targets.distinct("symbol", {"scored": False, "target_date": {"$lt": today}})
+        for symbol in symbols:
+            oldest = await db.prediction_targets.find_one(
+                {"symbol": symbol, "scored": False}, sort=[("target_date", 1)]
+            )
+            try:
+                data, _ = await loop.run_in_executor(
+                    live_executor, fetch_stock_data, symbol, history_period_since(oldest['target_date'])
+                )
+            except Exception as e:
+                logger.warning(f"Accuracy sweep could not fetch {symbol}: {getattr(e, 'detail', e)}")
+                continue
+            await self.score_bars(symbol, data)
+
+    async def run(self):
+        await self.ensure_indexes()
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.warning(f"Accuracy sweep failed: {e}")
+            await asyncio.sleep(ACCURACY_SWEEP_SECONDS)
+
+accuracy_tracker = AccuracyTracker()
 
 # API Routes
 @api_router.get("/")
 async def root():
-    return {"message": "Stock Price Prediction API"}
+    return {"message": "Stock Price Prediction API", "prediction_mode": PREDICTION_MODE}
 
 @api_router.post("/predict", response_model=StockPrediction)
 async def predict_stock(request: StockRequest):
     """Predict stock prices using LSTM"""
+    if request.feature_set not in FEATURE_SETS:
+        raise HTTPException(status_code=400, detail=f"Unknown feature set: {request.feature_set}")
     try:
+        if PREDICTION_MODE == 'queue':
+            job_id = await enqueue_prediction_job(request)
+            return await wait_for_prediction_job(job_id)
+        
+        if request.request_key:
+            existing = await db.predictions.find_one({"request_key": request.request_key})
+            if existing is not None:
+                return StockPrediction(**existing)
+        
         # Run prediction in thread pool to avoid blocking
         loop = asyncio.get_event_loop()
         result = await loop.run_in_executor(
@@ -302,18 +1061,26 @@ async def predict_stock(request: StockRequest):
             train_and_predict, 
             request.symbol.upper(), 
             request.period, 
-            request.prediction_days
+            request.prediction_days,
+            request.feature_set
         )
         
         # Save prediction to database
-        prediction = StockPrediction(**result)
-        await db.predictions.insert_one(prediction.dict())
-        
-        return prediction
+        return await store_prediction(result, request.request_key)
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.get("/jobs/{job_id}", response_model=PredictionJob)
+async def get_prediction_job(job_id: str):
+    """Get the status of a queued prediction job"""
+    job = await db.prediction_jobs.find_one({"_id": job_id})
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job_from_document(job)
+
 @api_router.get("/analyze/{symbol}")
 async def analyze_stock(symbol: str):
     """Get current stock analysis"""
@@ -324,12 +1091,86 @@ async def analyze_stock(symbol: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@api_router.websocket("/ws/watchlist")
+async def watchlist_feed(websocket: WebSocket):
+    """Stream StockAnalysis updates for subscribed symbols.
+
+    Clients send {"action": "subscribe" | "unsubscribe", "symbols": [...]},
+    holding at most LIVE_MAX_SYMBOLS subscriptions per connection.
+    """
+    await websocket.accept()
+    client = LiveClient()
+    symbols = set()
+    
+    async def sender():
+        while True:
+            message = await client.next()
+            await websocket.send_text(message)
+    
+    send_task = asyncio.create_task(sender())
+    try:
+        while True:
+            try:
+                request = json.loads(await websocket.receive_text())
+                action = request.get('action')
+                requested = request.get('symbols', [])
+                # A bare string would otherwise be iterated letter by letter
+                if not isinstance(requested, list) or not all(isinstance(symbol, str) and symbol for symbol in requested):
+                    raise ValueError("symbols must be a list of ticker strings")
+                requested = [symbol.upper() for symbol in requested]
+            except (ValueError, AttributeError, TypeError):
+                client.offer("error", json.dumps({"type": "error", "detail": "Invalid message"}))
+                continue
+            
+            if action == 'subscribe':
+                if len(symbols | set(requested)) > LIVE_MAX_SYMBOLS:
+                    client.offer("error", json.dumps({
+                        "type": "error", "detail": f"At most {LIVE_MAX_SYMBOLS} symbols per connection"
+                    }))
+                    continue
+                for symbol in requested:
+                    symbols.add(symbol)
+                    live_hub.subscribe(symbol, client)
+            elif action == 'unsubscribe':
+                for symbol in requested:
+                    symbols.discard(symbol)
+                    live_hub.unsubscribe(symbol, client)
+            else:
+                client.offer("error", json.dumps({"type": "error", "detail": f"Unknown action: {action}"}))
+                continue
+            client.offer("subscribed", json.dumps({"type": "subscribed", "symbols": sorted(symbols)}))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        send_task.cancel()
+        for symbol in symbols:
+            live_hub.unsubscribe(symbol, client)
+
 @api_router.get("/predictions", response_model=List[StockPrediction])
 async def get_predictions(limit: int = 10):
     """Get recent predictions"""
     predictions = await db.predictions.find().sort("timestamp", -1).limit(limit).to_list(limit)
     return [StockPrediction(**pred) for pred in predictions]
 
+@api_router.get("/accuracy", response_model=List[AccuracySummary])
+async def get_accuracy_summaries():
+    """Get realized accuracy of stored predictions for every tracked symbol"""
+    stats = await db.accuracy_stats.find().sort("_id", 1).to_list(None)
+    return [summarize_accuracy(doc) for doc in stats]
+
+@api_router.get("/accuracy/{symbol}", response_model=AccuracySummary)
+async def get_accuracy_summary(symbol: str):
+    """Get realized accuracy of stored predictions for one symbol"""
+    stats = await db.accuracy_stats.find_one({"_id": symbol.upper()})
+    if stats is None:
+        raise HTTPException(status_code=404, detail=f"No realized predictions for {symbol.upper()} yet")
+    return summarize_accuracy(stats)
+
+@api_router.get("/feature-sets")
+async def get_feature_sets():
+    """Get the feature sets available for training"""
+    return {"feature_sets": FEATURE_SETS}
+
 @api_router.get("/popular-stocks")
 async def get_popular_stocks():
     """Get popular stock symbols"""
@@ -366,7 +1207,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def prepare_job_queue():
+    # The request_key index also de-duplicates keyed requests in local mode
+    await ensure_job_indexes()
+
+@app.on_event("startup")
+async def start_accuracy_tracker():
+    app.state.accuracy_task = asyncio.create_task(accuracy_tracker.run())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    app.state.accuracy_task.cancel()
+    await live_hub.shutdown()
     client.close()
-    executor.shutdown(wait=True)
\ No newline at end of file
+    executor.shutdown(wait=True)
+    live_executor.shutdown(wait=True)
\ No newline at end of file
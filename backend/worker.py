@@ -0,0 +1,114 @@
+"""Prediction worker process for PREDICTION_MODE=queue.
+
+Run any number of these, on this host or others pointing at the same MongoDB:
+
+    python worker.py
+    python worker.py --processes 4   # several local workers, e.g. for testing
+
+Each worker claims jobs from db.prediction_jobs with a lease, keeps the lease
+alive while training, and writes the prediction back. Jobs whose worker dies
+are picked up again once the lease expires. Only requests carrying the same
+request_key share a job; unkeyed requests each get their own, as in local mode.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import uuid
+
+from fastapi import HTTPException
+
+from server import (
+    executor,
+    client,
+    train_and_predict,
+    ensure_job_indexes,
+    claim_prediction_job,
+    renew_job_lease,
+    complete_prediction_job,
+    fail_prediction_job,
+    expire_abandoned_jobs,
+    JOB_LEASE_SECONDS,
+)
+
+IDLE_POLL_SECONDS = float(os.environ.get('WORKER_POLL_SECONDS', '2'))
+
+logger = logging.getLogger("worker")
+
+async def keep_lease(job_id: str, worker_id: str):
+    """Renew the job lease until cancelled"""
+    while True:
+        await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+        if not await renew_job_lease(job_id, worker_id):
+            logger.warning(f"Lost lease on job {job_id}")
+            return
+
+async def run_job(job: dict, worker_id: str):
+    """Train for a claimed job and record the outcome"""
+    job_id = job["_id"]
+    logger.info(f"Worker {worker_id} running job {job_id} (attempt {job['attempts']})")
+    heartbeat = asyncio.create_task(keep_lease(job_id, worker_id))
+    try:
+        loop = asyncio.get_event_loop()
+        result = await loop.run_in_executor(
+            executor,
+            train_and_predict,
+            job["symbol"],
+            job["period"],
+            job["prediction_days"],
+            job.get("feature_set", "price")
+        )
+        await complete_prediction_job(job_id, result)
+        logger.info(f"Job {job_id} done")
+    except Exception as e:
+        detail = getattr(e, 'detail', str(e))
+        status_code = e.status_code if isinstance(e, HTTPException) else 500
+        # Bad input (e.g. an unknown symbol) fails the same way on every attempt
+        retry = status_code >= 500
+        logger.warning(f"Job {job_id} failed: {detail}")
+        await fail_prediction_job(job_id, worker_id, detail, retry=retry, status_code=status_code)
+    finally:
+        heartbeat.cancel()
+
+async def main():
+    worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    await ensure_job_indexes()
+    logger.info(f"Worker {worker_id} started")
+    try:
+        while True:
+            await expire_abandoned_jobs()
+            job = await claim_prediction_job(worker_id)
+            if job is None:
+                await asyncio.sleep(IDLE_POLL_SECONDS)
+                continue
+            await run_job(job, worker_id)
+    finally:
+        client.close()
+
+def run_worker():
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run prediction queue workers")
+    parser.add_argument("--processes", type=int, default=1, help="number of worker processes to start")
+    args = parser.parse_args()
+    
+    if args.processes <= 1:
+        run_worker()
+    else:
+        # Spawn rather than fork so each worker gets its own TensorFlow and Mongo client
+        context = multiprocessing.get_context("spawn")
+        workers = [context.Process(target=run_worker) for _ in range(args.processes)]
+        for process in workers:
+            process.start()
+        try:
+            for process in workers:
+                process.join()
+        except KeyboardInterrupt:
+            for process in workers:
+                process.join()
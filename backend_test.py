@@ -29,6 +29,9 @@ class BackendTester:
             'failed': 0,
             'errors': []
         }
+        # Unique per run so de-duplication is tested against a fresh key
+        self.request_key = f"backend-test-{int(time.time())}"
+        self.prediction_id = None
         
     def log_result(self, test_name, success, message="", response_data=None):
         """Log test result"""
@@ -303,6 +306,325 @@ class BackendTester:
         
         return False
 
+    def test_watchlist_feed(self):
+        """Test 8: Live Watchlist WebSocket Feed"""
+        print("🔍 Testing Live Watchlist Feed (WebSocket)...")
+        try:
+            from websockets.sync.client import connect
+            
+            ws_url = API_BASE_URL.replace("http", "ws", 1) + "/ws/watchlist"
+            with connect(ws_url, open_timeout=10) as websocket:
+                websocket.send(json.dumps({"action": "subscribe", "symbols": ["AAPL"]}))
+                
+                # Wait for the first analysis update (acks may arrive first)
+                deadline = time.time() + 60
+                while time.time() < deadline:
+                    message = json.loads(websocket.recv(timeout=60))
+                    if message.get("type") == "analysis":
+                        data = message["data"]
+                        if data.get("symbol") == "AAPL" and "recommendation" in data:
+                            self.log_result("Watchlist Feed", True, 
+                                          "Received live analysis for AAPL", 
+                                          {k: v for k, v in data.items() if k in ['symbol', 'current_price', 'recommendation']})
+                            return True
+                        self.log_result("Watchlist Feed", False, 
+                                      "Analysis update missing expected fields", message)
+                        return False
+                    if message.get("type") == "error":
+                        self.log_result("Watchlist Feed", False, 
+                                      f"Feed returned error: {message.get('detail')}")
+                        return False
+                
+                self.log_result("Watchlist Feed", False, "No analysis update received")
+                
+        except TimeoutError:
+            self.log_result("Watchlist Feed", False, "Timed out waiting for analysis update")
+        except Exception as e:
+            self.log_result("Watchlist Feed", False, f"Unexpected error: {str(e)}")
+        
+        return False
+
+    def test_accuracy_summary(self):
+        """Test 9: Realized Accuracy Summary"""
+        print("🔍 Testing Realized Accuracy Summary...")
+        try:
+            response = requests.get(f"{API_BASE_URL}/accuracy", timeout=10)
+            
+            if response.status_code == 200:
+                data = response.json()
+                if isinstance(data, list):
+                    required_fields = ['symbol', 'scored', 'mae', 'rmse', 'mape']
+                    incomplete = [item.get('symbol') for item in data
+                                  if any(field not in item for field in required_fields)]
+                    if not incomplete:
+                        self.log_result("Accuracy Summary", True, 
+                                      f"Retrieved accuracy for {len(data)} symbols", 
+                                      {"count": len(data), "sample": data[0] if data else "Nothing realized yet"})
+                        return True
+                    self.log_result("Accuracy Summary", False, 
+                                  f"Summaries missing required fields: {incomplete}", data)
+                else:
+                    self.log_result("Accuracy Summary", False, 
+                                  "Response should be a list", data)
+            else:
+                self.log_result("Accuracy Summary", False, 
+                              f"Unexpected status code: {response.status_code}")
+                
+        except requests.exceptions.RequestException as e:
+            self.log_result("Accuracy Summary", False, f"Connection error: {str(e)}")
+        except Exception as e:
+            self.log_result("Accuracy Summary", False, f"Unexpected error: {str(e)}")
+        
+        return False
+
+    def test_prediction_request_key(self):
+        """Test 10: Repeated Request Key Returns the Same Prediction"""
+        print("🔍 Testing Prediction De-duplication by Request Key...")
+        print("⚠️  Note: ML model training may take 30-60 seconds...")
+        try:
+            payload = {
+                "symbol": "AAPL",
+                "period": "1y",
+                "prediction_days": 7,
+                "request_key": self.request_key
+            }
+            
+            ids = []
+            for _ in range(2):
+                response = requests.post(f"{API_BASE_URL}/predict", 
+                                       json=payload, 
+                                       timeout=120,
+                                       headers={'Content-Type': 'application/json'})
+                if response.status_code != 200:
+                    self.log_result("Prediction Request Key", False, 
+                                  f"Unexpected status code: {response.status_code}")
+                    return False
+                ids.append(response.json().get('id'))
+            
+            if ids[0] and ids[0] == ids[1]:
+                self.prediction_id = ids[0]
+                self.log_result("Prediction Request Key", True, 
+                              f"Both requests returned prediction {ids[0]}")
+                return True
+            else:
+                self.log_result("Prediction Request Key", False, 
+                              f"Requests returned different predictions: {ids}")
+                
+        except requests.exceptions.Timeout:
+            self.log_result("Prediction Request Key", False, 
+                          "Request timed out - ML model training took too long")
+        except requests.exceptions.RequestException as e:
+            self.log_result("Prediction Request Key", False, f"Connection error: {str(e)}")
+        except Exception as e:
+            self.log_result("Prediction Request Key", False, f"Unexpected error: {str(e)}")
+        
+        return False
+
+    def test_job_status(self):
+        """Test 11: Prediction Job Status"""
+        print("🔍 Testing Prediction Job Status...")
+        try:
+            response = requests.get(f"{API_BASE_URL}/jobs/no-such-job-{self.request_key}", timeout=10)
+            if response.status_code != 404:
+                self.log_result("Job Status", False, 
+                              f"Unknown job should return 404, got: {response.status_code}")
+                return False
+            
+            mode = requests.get(f"{API_BASE_URL}/", timeout=10).json().get('prediction_mode')
+            if mode != 'queue':
+                self.log_result("Job Status", True, 
+                              f"Unknown job returned 404 (server in {mode} mode, no queued jobs to check)")
+                return True
+            
+            response = requests.get(f"{API_BASE_URL}/jobs/{self.request_key}", timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                required_fields = ['id', 'symbol', 'status', 'attempts', 'result_id']
+                missing_fields = [field for field in required_fields if field not in data]
+                if missing_fields:
+                    self.log_result("Job Status", False, 
+                                  f"Missing required fields: {missing_fields}", data)
+                elif data['status'] == 'done' and data['result_id'] == self.prediction_id:
+                    self.log_result("Job Status", True, 
+                                  f"Job {data['id']} is done with the returned prediction", data)
+                    return True
+                else:
+                    self.log_result("Job Status", False, 
+                                  "Job should be done and point at the returned prediction", data)
+            else:
+                self.log_result("Job Status", False, 
+                              f"Unexpected status code: {response.status_code}")
+                
+        except requests.exceptions.RequestException as e:
+            self.log_result("Job Status", False, f"Connection error: {str(e)}")
+        except Exception as e:
+            self.log_result("Job Status", False, f"Unexpected error: {str(e)}")
+        
+        return False
+
+    def test_accuracy_symbol(self):
+        """Test 12: Realized Accuracy for One Symbol"""
+        print("🔍 Testing Realized Accuracy by Symbol...")
+        try:
+            response = requests.get(f"{API_BASE_URL}/accuracy/INVALID123", timeout=10)
+            if response.status_code != 404:
+                self.log_result("Accuracy by Symbol", False, 
+                              f"Unknown symbol should return 404, got: {response.status_code}")
+                return False
+            
+            summaries = requests.get(f"{API_BASE_URL}/accuracy", timeout=10).json()
+            if not summaries:
+                self.log_result("Accuracy by Symbol", True, 
+                              "Unknown symbol returned 404 (no realized predictions yet to check fields)")
+                return True
+            
+            symbol = summaries[0]['symbol']
+            response = requests.get(f"{API_BASE_URL}/accuracy/{symbol}", timeout=10)
+            if response.status_code == 200:
+                data = response.json()
+                expected_types = {
+                    'symbol': str, 'scored': int, 'window': int, 'mae': (int, float),
+                    'rmse': (int, float), 'mape': (int, float), 'lifetime_mae': (int, float)
+                }
+                wrong_fields = [field for field, kind in expected_types.items()
+                                if not isinstance(data.get(field), kind)]
+                direction = data.get('direction_accuracy')
+                if wrong_fields:
+                    self.log_result("Accuracy by Symbol", False, 
+                                  f"Missing or mistyped fields: {wrong_fields}", data)
+                elif not (0 < data['window'] <= data['scored'] and data['mae'] >= 0 and data['rmse'] >= data['mae']):
+                    self.log_result("Accuracy by Symbol", False, 
+                                  "Inconsistent error aggregates", data)
+                elif direction is not None and not 0 <= direction <= 100:
+                    self.log_result("Accuracy by Symbol", False, 
+                                  f"Direction accuracy out of range: {direction}", data)
+                else:
+                    self.log_result("Accuracy by Symbol", True, 
+                                  f"Accuracy for {symbol} is well formed", data)
+                    return True
+            else:
+                self.log_result("Accuracy by Symbol", False, 
+                              f"Unexpected status code: {response.status_code}")
+                
+        except requests.exceptions.RequestException as e:
+            self.log_result("Accuracy by Symbol", False, f"Connection error: {str(e)}")
+        except Exception as e:
+            self.log_result("Accuracy by Symbol", False, f"Unexpected error: {str(e)}")
+        
+        return False
+
+    def test_feature_sets(self):
+        """Test 13: Available Feature Sets"""
+        print("🔍 Testing Feature Sets Endpoint...")
+        try:
+            response = requests.get(f"{API_BASE_URL}/feature-sets", timeout=10)
+            
+            if response.status_code == 200:
+                data = response.json()
+                feature_sets = data.get("feature_sets")
+                if isinstance(feature_sets, dict) and "price" in feature_sets and "trend" in feature_sets:
+                    # Close is the training target, so every set must start with it
+                    bad_sets = [name for name, columns in feature_sets.items()
+                                if not columns or columns[0] != "Close"]
+                    if not bad_sets:
+                        self.log_result("Feature Sets", True, 
+                                      f"Retrieved {len(feature_sets)} feature sets", data)
+                        return True
+                    self.log_result("Feature Sets", False, 
+                                  f"Feature sets not starting with Close: {bad_sets}", data)
+                else:
+                    self.log_result("Feature Sets", False, 
+                                  "Response missing 'price'/'trend' feature sets", data)
+            else:
+                self.log_result("Feature Sets", False, 
+                              f"Unexpected status code: {response.status_code}")
+                
+        except requests.exceptions.RequestException as e:
+            self.log_result("Feature Sets", False, f"Connection error: {str(e)}")
+        except Exception as e:
+            self.log_result("Feature Sets", False, f"Unexpected error: {str(e)}")
+        
+        return False
+
+    def test_prediction_feature_set(self):
+        """Test 14: Stock Prediction with a Multivariate Feature Set"""
+        print("🔍 Testing Stock Prediction (Feature Set: trend)...")
+        print("⚠️  Note: ML model training may take 30-60 seconds...")
+        try:
+            payload = {
+                "symbol": "AAPL",
+                "period": "2y",
+                "prediction_days": 7,
+                "feature_set": "trend"
+            }
+            
+            response = requests.post(f"{API_BASE_URL}/predict", 
+                                   json=payload, 
+                                   timeout=120,
+                                   headers={'Content-Type': 'application/json'})
+            
+            if response.status_code == 200:
+                data = response.json()
+                if (data.get('feature_set') == 'trend' and
+                    isinstance(data.get('predictions'), list) and
+                    len(data['predictions']) == payload['prediction_days'] and
+                    all(isinstance(value, (int, float)) and value > 0 for value in data['predictions'])):
+                    self.log_result("Stock Prediction (Feature Set)", True, 
+                                  f"Trend-feature prediction completed - {len(data['predictions'])} days predicted", 
+                                  {
+                                      'feature_set': data['feature_set'],
+                                      'accuracy': data['metrics'].get('accuracy', 'N/A'),
+                                      'sample_prediction': data['predictions'][0]
+                                  })
+                    return True
+                else:
+                    self.log_result("Stock Prediction (Feature Set)", False, 
+                                  "Invalid data structure in response", data)
+            else:
+                self.log_result("Stock Prediction (Feature Set)", False, 
+                              f"Unexpected status code: {response.status_code}")
+                
+        except requests.exceptions.Timeout:
+            self.log_result("Stock Prediction (Feature Set)", False, 
+                          "Request timed out - ML model training took too long")
+        except requests.exceptions.RequestException as e:
+            self.log_result("Stock Prediction (Feature Set)", False, f"Connection error: {str(e)}")
+        except Exception as e:
+            self.log_result("Stock Prediction (Feature Set)", False, f"Unexpected error: {str(e)}")
+        
+        return False
+
+    def test_prediction_unknown_feature_set(self):
+        """Test 15: Stock Prediction with an Unknown Feature Set"""
+        print("🔍 Testing Stock Prediction (Unknown Feature Set)...")
+        try:
+            payload = {
+                "symbol": "AAPL",
+                "period": "1y",
+                "prediction_days": 7,
+                "feature_set": "no-such-set"
+            }
+            
+            response = requests.post(f"{API_BASE_URL}/predict", 
+                                   json=payload, 
+                                   timeout=30,
+                                   headers={'Content-Type': 'application/json'})
+            
+            if response.status_code == 400:
+                self.log_result("Stock Prediction (Unknown Feature Set)", True, 
+                              "Properly rejected unknown feature set", response.json())
+                return True
+            else:
+                self.log_result("Stock Prediction (Unknown Feature Set)", False, 
+                              f"Should return 400, got: {response.status_code}")
+                
+        except requests.exceptions.RequestException as e:
+            self.log_result("Stock Prediction (Unknown Feature Set)", False, f"Connection error: {str(e)}")
+        except Exception as e:
+            self.log_result("Stock Prediction (Unknown Feature Set)", False, f"Unexpected error: {str(e)}")
+        
+        return False
+
     def run_all_tests(self):
         """Run all backend tests"""
         print("=" * 80)
@@ -320,7 +642,15 @@ class BackendTester:
             self.test_stock_analysis_invalid,
             self.test_stock_prediction_valid,
             self.test_stock_prediction_invalid,
-            self.test_predictions_history
+            self.test_predictions_history,
+            self.test_watchlist_feed,
+            self.test_accuracy_summary,
+            self.test_prediction_request_key,
+            self.test_job_status,
+            self.test_accuracy_symbol,
+            self.test_feature_sets,
+            self.test_prediction_feature_set,
+            self.test_prediction_unknown_feature_set
         ]
         
         for test in tests: